@@ -1,13 +1,18 @@
 import os
-import requests
-from flask import Flask, jsonify, render_template, request, session
-from flask_caching import Cache
+import asyncio
+import httpx
+from quart import Quart, jsonify, render_template, request, session
 import sqlite3
 
-from helpers import update_session, build_current_weather, build_hourly_forecast, build_daily_forecast
+from caching import SizedLRUCache
+from helpers import (
+    update_session, build_current_weather, build_hourly_forecast, build_daily_forecast,
+    compact_current_weather, compact_hourly_forecast, compact_daily_forecast, compact_coordinates,
+    normalize_city_name,
+)
 
 # Configure application
-app = Flask(__name__)
+app = Quart(__name__)
 app.secret_key = os.environ.get("FLASK_SECRET_KEY", os.urandom(24))
 
 # Ensure templates are auto-reloaded
@@ -20,7 +25,23 @@ api_key = "0ef451aa617998b929aa1e094b1f157d"
 DB_PATH = "data/cities.db"  # adjust path if needed
 
 # Cache handling
-cache = Cache(app, config={'CACHE_TYPE': 'simple'})  # Use 'redis' for production
+# Entries are bounded by memory, evicted least recently used first
+cache = SizedLRUCache(max_bytes=int(os.environ.get("CACHE_MAX_BYTES", 32 * 1024 * 1024)))  # Use redis for production
+
+# Upstream HTTP client, shared by every request in this worker process.
+# The pool is sized so one worker can hold hundreds of upstream waits.
+HTTP_TIMEOUT = httpx.Timeout(10.0)
+HTTP_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+http_client = None
+
+@app.before_serving
+async def open_http_client():
+    global http_client
+    http_client = httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+
+@app.after_serving
+async def close_http_client():
+    await http_client.aclose()
 
 # Browser cache
 @app.after_request
@@ -29,6 +50,11 @@ def after_request(response):
     if request.method == 'GET':
         if request.path in ['/weather', '/cities']:
             response.headers["Cache-Control"] = "public, max-age=300"
+        elif request.path == '/static/cities/manifest.json':
+            response.headers["Cache-Control"] = "no-cache"
+        elif request.path.startswith('/static/cities/'):
+            # City index shards are fingerprinted by db/build.py
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
         elif request.path == '/settings':
             response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
     else:
@@ -40,7 +66,7 @@ def after_request(response):
 # MAIN ROUTES
 # Home page
 @app.route("/")
-def index():
+async def index():
     city = request.args.get("city")
     lat = request.args.get("lat")
     lon = request.args.get("lon")
@@ -55,7 +81,7 @@ def index():
             lat = float(lat)
             lon = float(lon)
         except (ValueError, TypeError):
-            return render_template("apology.html", message="Invalid coordinates")
+            return await render_template("apology.html", message="Invalid coordinates")
     else:
         lat = lon = None
 
@@ -71,30 +97,38 @@ def index():
                 city = "Bulawayo"
 
         if not (lat and lon):
-            coordinates, error = get_coordinates(city)
+            coordinates, error = await get_coordinates(city)
             if error:
-                return render_template("apology.html", message=error)
-            lat = coordinates[0]["lat"]
-            lon = coordinates[0]["lon"]
+                return await render_template("apology.html", message=error)
+            lat = coordinates[0].lat
+            lon = coordinates[0].lon
+
+    # Fetch current weather, daily and hourly forecasts concurrently
+    (
+        (weather_current_raw, current_error),
+        (forecast_daily_raw, daily_error),
+        (forecast_hourly_raw, hourly_error),
+    ) = await asyncio.gather(
+        get_current_weather(lat, lon, units=units),
+        get_daily_forecast(lat, lon, units=units),
+        get_hourly_forecast(lat, lon, units=units),
+    )
 
-    # Fetch weather
-    weather_current_raw, error = get_current_weather(lat, lon, units=units)
-    if error:
-        return render_template("apology.html", message=error)
+    # Current weather
+    if current_error:
+        return await render_template("apology.html", message=current_error)
 
     weather_current = build_current_weather(weather_current_raw, units=units)
 
     # Get daily forecast data
-    forecast_daily_raw, error = get_daily_forecast(lat, lon, units=units)
-    if error:
-        return render_template("apology.html", message=error)
+    if daily_error:
+        return await render_template("apology.html", message=daily_error)
     
     forecast_daily = build_daily_forecast(forecast_daily_raw)
 
     # Get hourly forecast data 
-    forecast_hourly_raw, error = get_hourly_forecast(lat, lon, units=units)
-    if error:
-        return render_template("apology.html", message=error)
+    if hourly_error:
+        return await render_template("apology.html", message=hourly_error)
     
     forecast_hourly = build_hourly_forecast(forecast_hourly_raw, forecast_daily=forecast_daily_raw)  # Use daily forecast for sunrise/sunset times
 
@@ -107,7 +141,7 @@ def index():
         city={"name": city, "lat": lat, "lon": lon},
     )
 
-    return render_template(
+    return await render_template(
         "index.html",
         city=city,
         weather_current=weather_current,
@@ -119,35 +153,39 @@ def index():
 
 # Cities page
 @app.route("/cities")
-def cities():
+async def cities():
     units = request.args.get("units")
     if units not in ("metric", "imperial"):
         units = session.get("units", "metric")
 
     recent = session.get("cities", [])
-    weather_cards = []
-
-    for city in recent:
-        weather_current_raw, error = get_current_weather(city["lat"], city["lon"], units=units)
-        if error:
-            continue
-
-        forecast_3hour_raw, error = get_3hour_forecast(city["lat"], city["lon"], units=units, blocks=5)
-        if error:
-            continue
 
-        forecast_daily_raw, error = get_daily_forecast(city["lat"], city["lon"], units=units, days=3)
-        if error:
-            continue
-
-        weather_cards.append({
+    async def build_card(city):
+        (
+            (weather_current_raw, current_error),
+            (forecast_3hour_raw, three_hour_error),
+            (forecast_daily_raw, daily_error),
+        ) = await asyncio.gather(
+            get_current_weather(city["lat"], city["lon"], units=units),
+            get_3hour_forecast(city["lat"], city["lon"], units=units, blocks=5),
+            get_daily_forecast(city["lat"], city["lon"], units=units, days=3),
+        )
+        if current_error or three_hour_error or daily_error:
+            return None
+
+        return {
             "city": city,
             "weather_current": build_current_weather(weather_current_raw),
             "forecast_3hour": build_hourly_forecast(forecast_3hour_raw),
             "forecast_daily": build_daily_forecast(forecast_daily_raw)
-        })
+        }
+
+    # Fetch all recent cities concurrently, skipping any that failed
+    cards = await asyncio.gather(*(build_card(city) for city in recent))
 
-    return render_template(
+    weather_cards = [card for card in cards if card is not None]
+
+    return await render_template(
         "cities.html",
         cities=weather_cards,
         active="cities"
@@ -156,19 +194,19 @@ def cities():
 
 # Settings page
 @app.route("/settings")
-def settings():
+async def settings():
     units = request.args.get("units")
     if units not in ("metric", "imperial"):
         units = session.get("units", "metric")
 
     update_session(units=units)
 
-    return render_template("settings.html", units=units, active="settings")
+    return await render_template("settings.html", units=units, active="settings")
 
 
 # HELPER FUNCTIONS
 # Get weather data
-def get_current_weather(lat, lon, units="metric"):
+async def get_current_weather(lat, lon, units="metric"):
     if lat is None or lon is None:
         return None, "City required"
     
@@ -181,7 +219,10 @@ def get_current_weather(lat, lon, units="metric"):
     # Cache miss - fetch from API
     url = "http://api.openweathermap.org/data/2.5/weather"
     params = {"lat": lat, "lon": lon, "appid": api_key, "units": units}
-    response = requests.get(url, params=params)
+    try:
+        response = await http_client.get(url, params=params)
+    except httpx.HTTPError:
+        return None, "Unable to fetch weather data"
 
     if response.status_code != 200:
         return None, "Unable to fetch weather data"
@@ -190,13 +231,15 @@ def get_current_weather(lat, lon, units="metric"):
     if data.get("cod") != 200:
         return None, "City not found"
     
+    data = compact_current_weather(data)
+
     # Store in cache for 5 minutes
     cache.set(cache_key, data, timeout=300)
     
     return data, None
 
 # Get hourly forecast data
-def get_hourly_forecast(lat, lon, units="metric", hours=24):
+async def get_hourly_forecast(lat, lon, units="metric", hours=24):
     """
     Fetches hourly weather forecast data from OpenWeatherMap.
 
@@ -218,7 +261,10 @@ def get_hourly_forecast(lat, lon, units="metric", hours=24):
     # Cache miss - fetch from API
     url = "http://api.openweathermap.org/data/2.5/forecast/hourly"
     params = {"lat": lat, "lon": lon, "appid": api_key, "cnt": hours, "units": units}
-    response = requests.get(url, params=params)
+    try:
+        response = await http_client.get(url, params=params)
+    except httpx.HTTPError:
+        return None, "Unable to fetch forecast data"
 
     if response.status_code != 200:
         return None, "Unable to fetch forecast data"
@@ -227,13 +273,15 @@ def get_hourly_forecast(lat, lon, units="metric", hours=24):
     if data.get("cod") != "200":
         return None, "City not found"
     
+    data = compact_hourly_forecast(data)
+
     # Store in cache for 30 minutes
     cache.set(cache_key, data, timeout=1800)
     
     return data, None
 
 # Get daily forecast data
-def get_daily_forecast(lat, lon, units="metric", days=7):
+async def get_daily_forecast(lat, lon, units="metric", days=7):
     """
     Fetches daily weather forecast data from OpenWeatherMap.
 
@@ -255,7 +303,10 @@ def get_daily_forecast(lat, lon, units="metric", days=7):
     # Cache miss - fetch from API
     url = "http://api.openweathermap.org/data/2.5/forecast/daily"
     params = {"lat": lat, "lon": lon, "appid": api_key, "cnt": days, "units": units}
-    response = requests.get(url, params=params)
+    try:
+        response = await http_client.get(url, params=params)
+    except httpx.HTTPError:
+        return None, "Unable to fetch forecast data"
 
     if response.status_code != 200:
         return None, "Unable to fetch forecast data"
@@ -264,13 +315,15 @@ def get_daily_forecast(lat, lon, units="metric", days=7):
     if data.get("cod") != "200":
         return None, "City not found"
     
+    data = compact_daily_forecast(data)
+
     # Store in cache for 3 hours
     cache.set(cache_key, data, timeout=10800)
     
     return data, None
 
 # Get 3-hour forecast data
-def get_3hour_forecast(lat, lon, units="metric", blocks=5):
+async def get_3hour_forecast(lat, lon, units="metric", blocks=5):
     """
     Fetches 3-hour weather forecast data from OpenWeatherMap.
 
@@ -293,7 +346,10 @@ def get_3hour_forecast(lat, lon, units="metric", blocks=5):
     # Cache miss - fetch from API    
     url = "http://api.openweathermap.org/data/2.5/forecast"
     params = {"lat": lat, "lon": lon, "appid": api_key, "cnt": blocks, "units": units}
-    response = requests.get(url, params=params)
+    try:
+        response = await http_client.get(url, params=params)
+    except httpx.HTTPError:
+        return None, "Unable to fetch forecast data"
 
     if response.status_code != 200:
         return None, "Unable to fetch forecast data"
@@ -302,13 +358,15 @@ def get_3hour_forecast(lat, lon, units="metric", blocks=5):
     if data.get("cod") != "200":
         return None, "City not found"
     
+    data = compact_hourly_forecast(data)
+
     # Store in cache for 1 hours
     cache.set(cache_key, data, timeout=3600)
     
     return data, None
 
 # Get coordinates using city name
-def get_coordinates(city):
+async def get_coordinates(city):
     if not city or city.strip() == "":
         return None, "City required"
     
@@ -323,8 +381,11 @@ def get_coordinates(city):
     # Cache miss - fetch from API
     url = "http://api.openweathermap.org/geo/1.0/direct"
     params = {"q": city, "limit": 1, "appid": api_key}
-    response = requests.get(url, params=params)
-    
+    try:
+        response = await http_client.get(url, params=params)
+    except httpx.HTTPError:
+        return None, "Unable to fetch location data"
+
     if response.status_code != 200:
         return None, "Unable to fetch location data"
     
@@ -332,6 +393,8 @@ def get_coordinates(city):
     if not data or len(data) == 0:
         return None, f"Coordinates for {city} not found"
     
+    data = compact_coordinates(data)
+
     # Cache for 30 days
     cache.set(cache_key, data, timeout=2592000)
     return data, None
@@ -355,7 +418,7 @@ def city_search():
             countries.name AS country
         FROM cities
         JOIN countries ON cities.country = countries.code
-        WHERE cities.name LIKE ?
+        WHERE cities.search_name LIKE ?
         ORDER BY
             LENGTH(cities.name) ASC,
             cities.name ASC
@@ -366,7 +429,7 @@ def city_search():
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row  # so we can access columns by name
     cur = conn.cursor()
-    cur.execute(query, (f"{city}%", limit))
+    cur.execute(query, (f"{normalize_city_name(city)}%", limit))
     rows = cur.fetchall()
     conn.close()
 
@@ -0,0 +1,234 @@
+# bench.py
+"""Throughput benchmark for the weather page against a mocked OWM.
+
+Every OWM call answers after a fixed delay and every request to "/" uses
+unique coordinates, so nothing is served from the cache.
+
+Scenarios, all with the same number of worker processes:
+  - baseline: the original Flask app with blocking requests.get (git
+    commit BASELINE), under gunicorn sync and gthread workers
+  - async: the current Quart app under hypercorn, one event loop and one
+    shared httpx.AsyncClient per worker
+
+Usage: python bench.py [--latency 0.2] [--workers 2]
+"""
+import argparse
+import asyncio
+import functools
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE = "753083c"  # last commit with Flask + requests.get
+
+CURRENT = {
+    "cod": 200, "name": "Bench", "dt": 1700000000, "timezone": 0,
+    "weather": [{"icon": "01d", "description": "clear sky", "main": "Clear"}],
+    "main": {"temp": 20, "temp_min": 18, "temp_max": 22, "feels_like": 20, "humidity": 40},
+    "wind": {"speed": 3}, "visibility": 10000, "clouds": {"all": 5},
+}
+HOURLY = {
+    "cod": "200", "city": {"timezone": 0},
+    "list": [
+        {"dt": 1700000000 + 3600 * i, "weather": [{"icon": "02d"}], "main": {"feels_like": 20}}
+        for i in range(24)
+    ],
+}
+DAILY = {
+    "cod": "200", "city": {"timezone": 0},
+    "list": [
+        {
+            "dt": 1700000000 + 86400 * i,
+            "sunrise": 1700000000 + 86400 * i + 20000,
+            "sunset": 1700000000 + 86400 * i + 60000,
+            "weather": [{"icon": "10d", "main": "Rain", "description": "light rain"}],
+            "temp": {"max": 25, "min": 12},
+        }
+        for i in range(7)
+    ],
+}
+
+
+def owm_payload(path):
+    if path.endswith("/weather"):
+        return CURRENT
+    if path.endswith("/daily"):
+        return DAILY
+    return HOURLY
+
+
+# -----------------------------
+# Server side (imported by gunicorn/hypercorn as bench:app)
+# -----------------------------
+def _baseline_app(baseline_dir, latency):
+    sys.path.insert(0, baseline_dir)
+    import app as weather_app
+
+    class MockResponse:
+        status_code = 200
+
+        def __init__(self, url):
+            self._data = owm_payload(url)
+
+        def json(self):
+            return self._data
+
+    def get(url, params=None):
+        time.sleep(latency)
+        return MockResponse(url)
+
+    weather_app.requests.get = get
+    return weather_app.app
+
+
+def _async_app(latency):
+    import app as weather_app
+
+    async def owm(request):
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json=owm_payload(request.url.path))
+
+    # The shared client is created at startup, after this patch
+    weather_app.httpx.AsyncClient = functools.partial(
+        httpx.AsyncClient, transport=httpx.MockTransport(owm)
+    )
+    return weather_app.app
+
+
+if os.environ.get("BENCH_SERVER") == "baseline":
+    app = _baseline_app(os.environ["BENCH_BASELINE_DIR"], float(os.environ["BENCH_LATENCY"]))
+elif os.environ.get("BENCH_SERVER") == "async":
+    app = _async_app(float(os.environ["BENCH_LATENCY"]))
+
+
+# -----------------------------
+# Client side
+# -----------------------------
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss_mb(pid):
+    """Resident memory of the server process and its workers."""
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids += [int(p) for p in f.read().split()]
+    except OSError:
+        return None
+
+    total = 0
+    for p in pids:
+        with open(f"/proc/{p}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    total += int(line.split()[1])
+    return total / 1024
+
+
+async def load(port, total, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        async def one(i):
+            async with sem:
+                start = time.perf_counter()
+                r = await client.get(f"http://127.0.0.1:{port}/", params={"lat": 10 + i / 10000, "lon": 20})
+                r.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return elapsed, latencies[len(latencies) // 2]
+
+
+def run(name, server, command, concurrency, args, baseline_dir):
+    port = free_port()
+    env = dict(
+        os.environ,
+        BENCH_SERVER=server,
+        BENCH_LATENCY=str(args.latency),
+        BENCH_BASELINE_DIR=baseline_dir,
+    )
+    total = concurrency * 5
+
+    proc = subprocess.Popen(
+        [sys.executable, "-m", *command(port)],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(100):
+            if proc.poll() is not None:
+                raise RuntimeError(f"{name}: server exited with code {proc.returncode}")
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/settings")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+
+        elapsed, p50 = asyncio.run(load(port, total, concurrency))
+        memory = rss_mb(proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "req_per_s": round(total / elapsed, 1),
+        "p50_ms": round(p50 * 1000),
+        "rss_mb": round(memory, 1) if memory else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2, help="mocked OWM delay in seconds")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=24)
+    parser.add_argument("--high-concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    workers = str(args.workers)
+
+    def gunicorn(*extra):
+        return lambda port: ["gunicorn", "-b", f"127.0.0.1:{port}", "-w", workers, *extra, "bench:app"]
+
+    def hypercorn(port):
+        return ["hypercorn", "-b", f"127.0.0.1:{port}", "-w", workers, "bench:app"]
+
+    scenarios = [
+        ("baseline, gunicorn sync", "baseline", gunicorn(), args.concurrency),
+        ("baseline, gunicorn gthread x8", "baseline", gunicorn("-k", "gthread", "--threads", "8"), args.concurrency),
+        ("async, hypercorn", "async", hypercorn, args.concurrency),
+        ("baseline, gunicorn gthread x8", "baseline", gunicorn("-k", "gthread", "--threads", "8"), args.high_concurrency),
+        ("async, hypercorn", "async", hypercorn, args.high_concurrency),
+    ]
+
+    with tempfile.TemporaryDirectory() as baseline_dir:
+        archive = subprocess.run(
+            ["git", "archive", BASELINE, "app.py", "helpers.py", "templates"],
+            cwd=BASE_DIR, check=True, capture_output=True,
+        ).stdout
+        subprocess.run(["tar", "-x", "-C", baseline_dir], input=archive, check=True)
+
+        for name, server, command, concurrency in scenarios:
+            print(json.dumps(run(name, server, command, concurrency, args, baseline_dir)), flush=True)
+
+
+if __name__ == "__main__":
+    main()
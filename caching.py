@@ -0,0 +1,106 @@
+# caching.py
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from time import time
+
+from cachelib import BaseCache
+
+# Per-entry bookkeeping not covered by sys.getsizeof of the key and value:
+# the (expires, size, value) tuple, its float and int, and the OrderedDict
+# node and hash-table slot. Measured with tracemalloc on CPython 3.11.
+ENTRY_OVERHEAD = 160
+
+
+class SizedLRUCache(BaseCache):
+    """In-process cache bounded by memory instead of entry count.
+
+    Values are pickled on set. Each entry counts towards ``max_bytes`` with
+    the in-memory size of its key and pickled value plus ``ENTRY_OVERHEAD``,
+    so the ceiling tracks the RAM the cache holds. When it is exceeded, the
+    least recently used entries are evicted. Expired entries are dropped
+    when they are read or reach the LRU end, so ``set`` never scans the cache.
+
+    app.py builds one per worker with the ``CACHE_MAX_BYTES`` ceiling.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, default_timeout=300):
+        super().__init__(default_timeout=default_timeout)
+        self._max_bytes = max_bytes
+        self._cache = OrderedDict()  # key -> (expires, size, pickled value)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _expires(self, timeout):
+        timeout = self._normalize_timeout(timeout)
+        return time() + timeout if timeout > 0 else 0
+
+    def _remove(self, key):
+        _, size, _ = self._cache.pop(key)
+        self._size -= size
+
+    def _live(self, key):
+        """Return the entry for key, dropping it first if it has expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires = entry[0]
+        if expires != 0 and expires <= time():
+            self._remove(key)
+            return None
+        return entry
+
+    def _evict(self):
+        while self._size > self._max_bytes:
+            self._remove(next(iter(self._cache)))
+
+    def _store(self, key, value, timeout):
+        """Insert a pickled value; caller must hold the lock."""
+        size = sys.getsizeof(value) + sys.getsizeof(key) + ENTRY_OVERHEAD
+        if key in self._cache:
+            self._remove(key)
+        if size > self._max_bytes:
+            return False
+
+        self._cache[key] = (self._expires(timeout), size, value)
+        self._size += size
+        self._evict()
+        return True
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return None
+            self._cache.move_to_end(key)
+        return pickle.loads(entry[2])
+
+    def set(self, key, value, timeout=None):
+        value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            return self._store(key, value, timeout)
+
+    def add(self, key, value, timeout=None):
+        value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if self._live(key) is not None:
+                return False
+            return self._store(key, value, timeout)
+
+    def delete(self, key):
+        with self._lock:
+            if key not in self._cache:
+                return False
+            self._remove(key)
+        return True
+
+    def has(self, key):
+        with self._lock:
+            return self._live(key) is not None
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._size = 0
+        return True
@@ -1,6 +1,10 @@
 import os
+import sys
 import json
 import gzip
+import shutil
+import hashlib
+from collections import defaultdict
 import ijson
 import sqlite3
 
@@ -15,6 +19,13 @@ SCHEMA_PATH = os.path.join(BASE_DIR, "db", "schema.sql")
 COUNTRIES_PATH = os.path.join(BASE_DIR, "db", "countries.json")
 CITIES_PATH = os.path.join(BASE_DIR, "db", "city.list.json.gz")
 
+sys.path.insert(0, BASE_DIR)
+from helpers import normalize_city_name
+
+# Autocomplete shards served to the frontend (static/app.js)
+SHARDS_DIR = os.path.join(BASE_DIR, "static", "cities")
+SHARD_PREFIX_LEN = 2
+
 # -----------------------------
 # Ensure data/ and DB exist
 # -----------------------------
@@ -55,22 +66,27 @@ for c in countries:
 conn.commit()
 print(f"Inserted {len(countries)} countries")
 
+country_names = {c["code"]: c["name"] for c in countries}
+
 # -----------------------------
 # Stream + insert cities
 # -----------------------------
 total = 0
+shards = defaultdict(list)
 cur.execute("BEGIN")
 
 with gzip.open(CITIES_PATH, "rt", encoding="utf-8") as f:
     for city in ijson.items(f, "item"):
+        key = normalize_city_name(city["name"])
         cur.execute(
             """
-            INSERT INTO cities (id, name, state, country, lat, lon)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO cities (id, name, search_name, state, country, lat, lon)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 int(city["id"]),
                 city["name"],
+                key,
                 city.get("state"),
                 city["country"],
                 float(city["coord"]["lat"]),  # float handled natively
@@ -79,8 +95,46 @@ with gzip.open(CITIES_PATH, "rt", encoding="utf-8") as f:
         )
         total += 1
 
+        # Same row /api/cities would return (it joins on countries)
+        country = country_names.get(city["country"])
+        if len(key) >= SHARD_PREFIX_LEN and country:
+            shards[key[:SHARD_PREFIX_LEN]].append([
+                city["name"],
+                city.get("state") or None,
+                country,
+                float(city["coord"]["lat"]),
+                float(city["coord"]["lon"])
+            ])
+
 conn.commit()
 print(f"Inserted {total} cities")
 print("Build complete: data/cities.db")
 
 conn.close()
+
+# -----------------------------
+# Write city index shards
+# -----------------------------
+# One gzipped JSON file per normalised prefix, ranked like /api/cities
+# (shortest name first, then by name). File names carry a content hash so
+# they can be cached forever; manifest.json maps each prefix to its file.
+shutil.rmtree(SHARDS_DIR, ignore_errors=True)
+os.makedirs(SHARDS_DIR)
+
+manifest = {}
+for prefix, rows in sorted(shards.items()):
+    rows.sort(key=lambda row: (len(row[0]), row[0]))
+    payload = json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha256(payload).hexdigest()[:12]
+    filename = f"{digest}.json.gz"
+
+    with open(os.path.join(SHARDS_DIR, filename), "wb") as f:
+        # mtime=0 keeps the output identical between builds
+        with gzip.GzipFile(fileobj=f, mode="wb", mtime=0) as gz:
+            gz.write(payload)
+    manifest[prefix] = filename
+
+with open(os.path.join(SHARDS_DIR, "manifest.json"), "w", encoding="utf-8") as f:
+    json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
+
+print(f"Wrote {len(manifest)} city index shards: static/cities/")
@@ -9,6 +9,7 @@ CREATE TABLE countries (
 CREATE TABLE cities (
     id INTEGER PRIMARY KEY,
     name TEXT NOT NULL,
+    search_name TEXT NOT NULL COLLATE NOCASE,  -- normalize_city_name(name), for prefix search
     state TEXT,
     country TEXT NOT NULL,
     lat REAL NOT NULL,
@@ -17,4 +18,5 @@ CREATE TABLE cities (
 );
 
 CREATE INDEX idx_cities_name ON cities(name);
+CREATE INDEX idx_cities_search_name ON cities(search_name);
 CREATE INDEX idx_cities_country ON cities(country);
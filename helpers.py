@@ -1,6 +1,8 @@
 # helpers.py
+import unicodedata
+from collections import namedtuple
 from datetime import datetime, timezone, timedelta
-from flask import session
+from quart import session
 
 # Mapping OpenWeather icons to Basmilius icons
 ICON = {
@@ -32,6 +34,30 @@ ICON = {
     "50n": "mist.svg",
 }
 
+# Compact cache records: only the OWM fields the build_* helpers read
+CurrentWeather = namedtuple("CurrentWeather", [
+    "name", "dt", "timezone", "icon", "description",
+    "temp", "temp_min", "temp_max", "feels_like", "humidity",
+    "wind_speed", "visibility", "clouds", "precipitation",
+])
+Forecast = namedtuple("Forecast", ["timezone", "list"])
+ForecastHour = namedtuple("ForecastHour", ["dt", "icon", "feels_like"])
+ForecastDay = namedtuple("ForecastDay", [
+    "dt", "sunrise", "sunset", "icon", "main", "description", "temp_max", "temp_min",
+])
+Coordinates = namedtuple("Coordinates", ["lat", "lon"])
+
+def normalize_city_name(name):
+    """Fold case and strip accents for city prefix search.
+
+    Shared by /api/cities, db/build.py and normalizeCity() in static/app.js,
+    so local and server autocomplete match the same cities.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(
+        c for c in decomposed if not unicodedata.category(c).startswith("M")
+    ).lower()
+
 def update_session(city=None, units=None):
     """Update session with city info and units preferences.
 
@@ -69,39 +95,97 @@ def update_session(city=None, units=None):
 
         session.modified = True
 
+# Project raw OWM responses down to compact cache records
+def compact_current_weather(data):
+    """Keep only the fields build_current_weather uses from /weather."""
+    main = data["main"]
+    return CurrentWeather(
+        name=data["name"],
+        dt=data["dt"],
+        timezone=data["timezone"],
+        icon=data["weather"][0]["icon"],
+        description=data["weather"][0]["description"],
+        temp=main["temp"],
+        temp_min=main["temp_min"],
+        temp_max=main["temp_max"],
+        feels_like=main["feels_like"],
+        humidity=main["humidity"],
+        wind_speed=data["wind"]["speed"],
+        visibility=data["visibility"],
+        clouds=data["clouds"]["all"],
+        precipitation=data.get("rain", {}).get("1h", 0),
+    )
+
+def compact_hourly_forecast(data):
+    """Keep only the fields build_hourly_forecast uses from /forecast and /forecast/hourly."""
+    return Forecast(
+        timezone=data["city"]["timezone"],
+        list=tuple(
+            ForecastHour(
+                dt=f["dt"],
+                icon=f["weather"][0]["icon"],
+                feels_like=f["main"]["feels_like"],
+            )
+            for f in data["list"]
+        ),
+    )
+
+def compact_daily_forecast(data):
+    """Keep only the fields build_daily_forecast and the sunrise/sunset markers use."""
+    return Forecast(
+        timezone=data["city"]["timezone"],
+        list=tuple(
+            ForecastDay(
+                dt=f["dt"],
+                sunrise=f["sunrise"],
+                sunset=f["sunset"],
+                icon=f["weather"][0]["icon"],
+                main=f["weather"][0]["main"],
+                description=f["weather"][0]["description"],
+                temp_max=f["temp"]["max"],
+                temp_min=f["temp"]["min"],
+            )
+            for f in data["list"]
+        ),
+    )
+
+def compact_coordinates(data):
+    """Keep only lat/lon from the geocoding response."""
+    return tuple(Coordinates(lat=c["lat"], lon=c["lon"]) for c in data)
+
 # Build current weather data structure
 def build_current_weather(weather_current, units="metric"):
-    icon_file = ICON.get(weather_current["weather"][0]["icon"], "default.webp")
+    icon_file = ICON.get(weather_current.icon, "default.webp")
 
     local_time = datetime.fromtimestamp(
-        weather_current["dt"] + weather_current["timezone"],
+        weather_current.dt + weather_current.timezone,
         tz=timezone.utc
     )
 
-    wind_speed = weather_current["wind"]["speed"]
+    wind_speed = weather_current.wind_speed
     if units == "metric":
         wind = f"{wind_speed * 3.6:.1f} km/h"
     else:
         wind = f"{wind_speed:.1f} mph"
 
-    visibility = f"{weather_current['visibility'] / 1000:.0f} km"
+    visibility = f"{weather_current.visibility / 1000:.0f} km"
 
-    precip = weather_current.get("rain", {}).get("1h", 0)
+    precip = weather_current.precipitation
     precip_unit = "mm/h" if units == "metric" else "in/h"
 
     return {
-        "name": weather_current["name"],
+        "name": weather_current.name,
         "local_time": local_time.strftime("%H:%M"),
 
-        "temp": f"{round(weather_current["main"]["temp"])}°",
-        "temp_min": round(weather_current["main"]["temp_min"]),
-        "temp_max": round(weather_current["main"]["temp_max"]),
-        "feels_like": f"{round(weather_current["main"]["feels_like"])}°",
-        "description": weather_current["weather"][0]["description"].title(),
+        "temp": f"{round(weather_current.temp)}°",
+        "temp_min": round(weather_current.temp_min),
+        "temp_max": round(weather_current.temp_max),
+        "feels_like": f"{round(weather_current.feels_like)}°",
+        "description": weather_current.description.title(),
 
         "wind": wind,
-        "humidity": f"{weather_current['main']['humidity']}%",
-        "clouds": f"{weather_current['clouds']['all']}%",
+        "humidity": f"{weather_current.humidity}%",
+        "clouds": f"{weather_current.clouds}%",
         "precipitation": f"{precip} {precip_unit}",
         "visibility": visibility,
 
@@ -114,7 +198,7 @@ def build_hourly_forecast(forecast_hourly, forecast_daily=None):
     Sunrise/sunset markers are added only if daily_forecast is provided.
     """
 
-    timezone_offset = forecast_hourly["city"]["timezone"]  # seconds from UTC
+    timezone_offset = forecast_hourly.timezone  # seconds from UTC
     local_timezone = timezone(timedelta(seconds=timezone_offset))
 
     items = []
@@ -125,20 +209,20 @@ def build_hourly_forecast(forecast_hourly, forecast_daily=None):
     inserted_sunset_dates = set()
 
     if forecast_daily:
-        for day in forecast_daily["list"]:
+        for day in forecast_daily.list:
             day_date = datetime.fromtimestamp(
-                day["dt"], tz=local_timezone
+                day.dt, tz=local_timezone
             ).date()
             sunrise_sunset_by_date[day_date] = {
-                "sunrise": day["sunrise"],
-                "sunset": day["sunset"]
+                "sunrise": day.sunrise,
+                "sunset": day.sunset
             }
 
-        first_hour = forecast_hourly["list"][0]["dt"]
+        first_hour = forecast_hourly.list[0].dt
     # --------------------------------------------------
 
-    for f in forecast_hourly["list"]:
-        hour = f["dt"]
+    for f in forecast_hourly.list:
+        hour = f.dt
         hour_datetime = datetime.fromtimestamp(hour, tz=local_timezone)
         hour_date = hour_datetime.date()
 
@@ -177,12 +261,12 @@ def build_hourly_forecast(forecast_hourly, forecast_daily=None):
         # ------------------------------------------------------
 
         # Normal forecast hour
-        icon_file = ICON.get(f["weather"][0]["icon"], "default.webp")
+        icon_file = ICON.get(f.icon, "default.webp")
         items.append({
             "type": "hour",
             "time": hour_datetime.strftime("%H:%M"),
             "icon": f"/static/icons/svg-static/{icon_file}",
-            "feels_like": f"{round(f['main']['feels_like'])}°",
+            "feels_like": f"{round(f.feels_like)}°",
             "dt": hour
         })
 
@@ -205,14 +289,14 @@ def build_daily_forecast(forecast_daily):
         ...
     ]
     """
-    timezone_offset = forecast_daily["city"]["timezone"]  # seconds from UTC
+    timezone_offset = forecast_daily.timezone  # seconds from UTC
     local_timezone = timezone(timedelta(seconds=timezone_offset))
     
     items = []
     today = datetime.now(tz=local_timezone).date()
     
-    for f in forecast_daily["list"]:
-        forecast_date = datetime.fromtimestamp(f["dt"], tz=local_timezone).date()
+    for f in forecast_daily.list:
+        forecast_date = datetime.fromtimestamp(f.dt, tz=local_timezone).date()
         
         # Determine day label
         day_diff = (forecast_date - today).days
@@ -223,15 +307,15 @@ def build_daily_forecast(forecast_daily):
         else:
             day_label = forecast_date.strftime("%A")  # Monday, Tuesday, etc.
         
-        icon_file = ICON.get(f["weather"][0]["icon"], "default.webp")
+        icon_file = ICON.get(f.icon, "default.webp")
         items.append({
             "day": day_label,
             "icon": f"/static/icons/svg-static/{icon_file}",
-            "main": f["weather"][0]["main"],  # "Sunny", "Cloudy", etc.
-            "description": f["weather"][0]["description"].title(),
-            "temp_max": round(f["temp"]["max"]),
-            "temp_min": round(f["temp"]["min"]),
-            "dt": f["dt"]
+            "main": f.main,  # "Sunny", "Cloudy", etc.
+            "description": f.description.title(),
+            "temp_max": round(f.temp_max),
+            "temp_min": round(f.temp_min),
+            "dt": f.dt
         })
     
     return items
@@ -1,5 +1,108 @@
 // static/app.js
 const App = (() => {
+	// Offline city index, built by db/build.py into static/cities/
+	const CITY_INDEX_URL = "/static/cities/";
+	const CITY_PREFIX_LEN = 2;
+	const CITY_LIMIT = 10;
+	let cityManifest;             // Promise of { prefix: shard file } or null
+	const cityShards = new Map(); // prefix -> Promise of shard rows or null
+	const cityRows = new Map();   // prefix -> shard rows that finished loading
+
+	// Must match normalize_city_name() in helpers.py
+	function normalizeCity(name) {
+		return name.normalize("NFKD").replace(/\p{M}/gu, "").toLowerCase();
+	}
+
+	function loadCityManifest() {
+		if (!cityManifest) {
+			cityManifest = fetch(CITY_INDEX_URL + "manifest.json")
+				.then(res => {
+					if (res.status === 404) return null; // shards not built, don't retry
+					if (!res.ok) throw new Error("Manifest error");
+					return res.json();
+				})
+				.catch(err => {
+					console.warn("City index unavailable:", err);
+					cityManifest = undefined; // retry on a later keystroke
+					return null;
+				});
+		}
+		return cityManifest;
+	}
+
+	function cityPrefix(query) {
+		return Array.from(normalizeCity(query)).slice(0, CITY_PREFIX_LEN).join("");
+	}
+
+	// Resolves to null only when the index can't be loaded, so callers fall back
+	// to the API. The manifest lists every prefix that has cities, so an
+	// unlisted prefix resolves to no rows without asking the server.
+	function loadCityShard(prefix) {
+		if (!cityShards.has(prefix)) {
+			const shard = (async () => {
+				const manifest = await loadCityManifest();
+				if (!manifest) {
+					cityShards.delete(prefix); // follow the manifest if it is retried
+					return null;
+				}
+
+				const file = manifest[prefix];
+				if (!file) {
+					cityRows.set(prefix, []);
+					return [];
+				}
+
+				const res = await fetch(CITY_INDEX_URL + file);
+				if (!res.ok) throw new Error("Shard error");
+
+				// Shards are gzipped on disk; hosts that already send them with
+				// Content-Encoding: gzip hand us plain JSON instead
+				let body = await res.arrayBuffer();
+				const bytes = new Uint8Array(body);
+				if (bytes[0] === 0x1f && bytes[1] === 0x8b) {
+					const stream = new Blob([body]).stream().pipeThrough(new DecompressionStream("gzip"));
+					body = await new Response(stream).arrayBuffer();
+				}
+
+				const rows = JSON.parse(new TextDecoder().decode(body)).map(
+					([name, state, country, lat, lon]) => ({ key: normalizeCity(name), name, state, country, lat, lon })
+				);
+				cityRows.set(prefix, rows);
+				return rows;
+			})().catch(err => {
+				console.warn("City index unavailable:", err);
+				cityShards.delete(prefix); // retry on a later keystroke
+				return null;
+			});
+			cityShards.set(prefix, shard);
+		}
+		return cityShards.get(prefix);
+	}
+
+	// Complete from the local index, or ask the server if it can't be loaded
+	async function searchCities(query) {
+		const key = normalizeCity(query);
+		const prefix = cityPrefix(query);
+
+		if (Array.from(prefix).length === CITY_PREFIX_LEN) {
+			const rows = await loadCityShard(prefix);
+			if (rows) {
+				const matches = [];
+				for (const row of rows) {
+					if (row.key.startsWith(key)) {
+						matches.push(row);
+						if (matches.length === CITY_LIMIT) break;
+					}
+				}
+				return matches;
+			}
+		}
+
+		const res = await fetch(`/api/cities?city=${encodeURIComponent(query)}`);
+		if (!res.ok) throw new Error("API error");
+		return res.json();
+	}
+
 	// Initialize city search input with autocomplete
 	function initCitySearch() {
 		const input = document.getElementById("cityInput");
@@ -46,10 +149,8 @@ const App = (() => {
 
 			debounceTimer = setTimeout(async () => {
 			try {
-				const res = await fetch(`/api/cities?city=${encodeURIComponent(query)}`);
-				if (!res.ok) throw new Error("API error");
-
-				const cities = await res.json();
+				const cities = await searchCities(query);
+				if (input.value.trim() !== query) return; // a newer keystroke won
 				resultsBox.innerHTML = "";
 
 				if (!cities.length) {
@@ -93,7 +194,7 @@ const App = (() => {
 			} catch (err) {
 				console.error("City search failed:", err);
 			}
-			}, 250);
+			}, cityRows.has(cityPrefix(query)) ? 0 : 250); // no need to debounce local lookups
 		});
 	}
 